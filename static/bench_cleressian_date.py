@@ -0,0 +1,158 @@
+""" Benchmarks for the hot paths of cleressian_date.
+
+    python bench_cleressian_date.py                          # run, and print the results
+    python bench_cleressian_date.py -o results.json          # ... and save them
+    python bench_cleressian_date.py -c baseline.json         # ... and flag regressions against a baseline
+
+Alongside the per-date benchmarks, `import` times a cold import of the module in a fresh interpreter.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from cleressian_date import CleressianDate, DateDelta
+
+# each benchmark is a name, and a function of the sample dates returning the callable to time
+Benchmark = Tuple[str, Callable[[List[CleressianDate]], Callable[[], object]]]
+
+
+def _sample_dates(n: int, seed: int = 0) -> List[CleressianDate]:
+    """ Return n pseudo-random dates spread over the first few grand cycles. """
+    rng = random.Random(seed)
+    return [CleressianDate.fromordinal(rng.randrange(0, 5 * 93381)) for _ in range(n)]
+
+
+def _benchmarks() -> List[Benchmark]:
+    benchmarks = [
+        ('construct', lambda dates: lambda: [CleressianDate(1, 2, 3, 4, 5) for _ in dates]),
+        ('construct.month_name', lambda dates: lambda: [CleressianDate(1, 2, 3, 'Fis', 5) for _ in dates]),
+        ('from_absolute_date', lambda dates: lambda: [CleressianDate.from_absolute_date(677, 43) for _ in dates]),
+        ('to_absolute_date', lambda dates: lambda: [date.to_absolute_date() for date in dates]),
+        ('fromordinal', lambda dates: lambda: [CleressianDate.fromordinal(12345) for _ in dates]),
+        ('compare.eq', lambda dates: lambda: [a == b for a, b in zip(dates, reversed(dates))]),
+        ('compare.lt', lambda dates: lambda: [a < b for a, b in zip(dates, reversed(dates))]),
+        ('sort', lambda dates: lambda: sorted(dates)),
+        ('add.small', lambda dates: lambda: [date + 10 for date in dates]),
+        ('add.large', lambda dates: lambda: [date + 50000 for date in dates]),
+        ('add.years_days', lambda dates: lambda: [date + (100, 10) for date in dates]),
+        ('sub.days', lambda dates: lambda: [date - 50000 for date in dates]),
+        ('sub.date', lambda dates: lambda: [a - b for a, b in zip(dates, reversed(dates))]),
+        ('distance', lambda dates: lambda: [CleressianDate.distance(a, b) for a, b in zip(dates, reversed(dates))]),
+        ('delta.total_days', lambda dates: (
+            lambda deltas: lambda: [delta.total_days(date) for delta, date in zip(deltas, dates)]
+        )([a - b for a, b in zip(dates, reversed(dates))])),
+        ('delta.normalize', lambda dates: lambda: [DateDelta(3, 400).normalize(date) for date in dates]),
+    ]
+
+    for template in ('%x', '%X'):
+        benchmarks.append((f'strftime.{template}', lambda dates, t=template: lambda: [date.strftime(t) for date in dates]))
+        benchmarks.append((f'strptime.{template}', lambda dates, t=template: (
+            lambda strings: lambda: [CleressianDate.strptime(s, t) for s in strings]
+        )([date.strftime(t) for date in dates])))
+
+    return benchmarks
+
+
+def import_time(repeat: int = 5) -> float:
+    """ Return the best time (in seconds) to import cleressian_date in a fresh interpreter, as reported
+    by -X importtime (so excluding the interpreter's own startup).
+    """
+    cmd = [sys.executable, '-X', 'importtime', '-c', 'import cleressian_date']
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    # the first import may also have to compile the module to bytecode
+    subprocess.run(cmd, cwd=cwd, check=True, capture_output=True)
+
+    times = []
+    for _ in range(repeat):
+        stderr = subprocess.run(cmd, cwd=cwd, check=True, capture_output=True, text=True).stderr
+        # import time: self [us] | cumulative | imported package
+        line = next(line for line in stderr.splitlines() if line.rstrip().endswith('| cleressian_date'))
+        times.append(int(line.split('|')[1]) / 1e6)
+
+    return min(times)
+
+
+def run(n: int = 1000, repeat: int = 5, only: str = '') -> Dict[str, float]:
+    """ Run each benchmark over n dates, returning the best time per date (in seconds) for each,
+    and the best time for a cold import (as `import`).
+    """
+    dates = _sample_dates(n)
+
+    results = {}
+    if not only or only in 'import':
+        results['import'] = import_time(repeat)
+        print(f'{"import":<24} {results["import"] * 1e3:10.3f} ms', file=sys.stderr)
+
+    for name, setup in _benchmarks():
+        if only and only not in name:
+            continue
+
+        func = setup(dates)
+        results[name] = min(timeit.repeat(func, number=1, repeat=repeat)) / n
+        print(f'{name:<24} {results[name] * 1e6:10.3f} us', file=sys.stderr)
+
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """ Return the benchmarks which are slower than the baseline by more than the given fraction. """
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+
+        ratio = seconds / baseline[name]
+        flag = 'REGRESSION' if ratio > 1 + threshold else ''
+        print(f'{name:<24} {ratio:8.2f}x {flag}', file=sys.stderr)
+
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of cleressian_date.')
+    parser.add_argument('-n', type=int, default=1000, help='number of dates per benchmark (default: 1000)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of repeats; the best is kept (default: 5)')
+    parser.add_argument('-k', '--only', default='', help='only run benchmarks whose name contains this string')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    parser.add_argument('-c', '--compare', help='compare against the results in this JSON file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='slowdown (as a fraction) beyond which a benchmark counts as a regression (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.repeat, args.only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'n': args.n,
+                'repeat': args.repeat,
+                'unit': 'seconds per date (import: seconds)',
+                'results': results,
+            }, f, indent=4)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s): ' + ', '.join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
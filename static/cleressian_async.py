@@ -0,0 +1,193 @@
+""" Parsing line-delimited date feeds (e.g., from an asyncio.StreamReader) without blocking the event loop. """
+import asyncio
+import collections
+import concurrent.futures
+import logging
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+
+from cleressian_date import CleressianDate, CleressianFormat, ParseFailure, ParseReport
+
+
+def _parse_batch(lines: List[str], template: str, first_line_number: int) -> Tuple[list, collections.Counter]:
+    """ Parse a batch of lines, returning a CleressianDate or ParseFailure for each non-blank line,
+    and the counts of overwritten fields (as in CleressianDate.parse_many).
+    """
+    fmt = CleressianFormat.compile(template)
+    conflicts = collections.Counter()
+
+    results = []
+    for line_number, line in enumerate(lines, start=first_line_number):
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
+
+        try:
+            results.append(fmt.parse(line, CleressianDate, conflicts))
+        except (ValueError, TypeError) as e:
+            results.append(ParseFailure(line_number, line, str(e)))
+
+    return results, conflicts
+
+
+async def _next(items: AsyncIterator) -> Tuple[bool, object]:
+    """ Return (True, the next item) from the async iterator, or (False, None) when it's exhausted. """
+    try:
+        return True, await items.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _batches(
+    source: AsyncIterable[Union[str, bytes]],
+    batch_size: int,
+    encoding: str,
+    max_delay: Optional[float] = None
+) -> AsyncIterator[List[str]]:
+    """ Group the lines of the source into lists of (at most) batch_size strings.
+
+    If max_delay is given, a partial batch is also flushed once no further line has arrived for that
+    many seconds, so that lines from a slow feed aren't held back waiting for a full batch.
+    """
+    lines = source.__aiter__()
+    batch = []
+    pending = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(_next(lines))
+
+            if batch and max_delay is not None:
+                # wait for the next line without cancelling the read, which carries on into the next batch
+                done, _ = await asyncio.wait({pending}, timeout=max_delay)
+                if not done:
+                    yield batch
+                    batch = []
+                    continue
+
+            more, line = await pending
+            pending = None
+            if not more:
+                break
+
+            batch.append(line.decode(encoding) if isinstance(line, bytes) else line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+    if batch:
+        yield batch
+
+
+def aparse_many(
+    source: AsyncIterable[Union[str, bytes]],
+    template: str = "%x",
+    errors: str = "raise",
+    report: Optional[ParseReport] = None,
+    batch_size: int = 256,
+    executor: Optional[concurrent.futures.Executor] = None,
+    prefetch: int = 2,
+    encoding: str = "utf-8",
+    max_delay: Optional[float] = 0.05
+) -> AsyncIterator[Union[CleressianDate, ParseFailure]]:
+    """ Asynchronously parse each line of the source, as in CleressianDate.parse_many.
+
+    The source may be an asyncio.StreamReader or any async iterable of lines (str or bytes). Lines are
+    parsed in batches of batch_size, between which control returns to the event loop. A partial batch
+    is parsed as soon as no further line arrives within max_delay seconds (None to always wait for a
+    full batch or the end of the source), so dates from a slow feed come through promptly. If an executor
+    is given, batches are parsed there instead, with up to `prefetch` batches read ahead of the
+    consumer; otherwise, at most one line is read ahead of what the consumer asks for, so a slow consumer
+    naturally slows the reads from the source.
+
+    Lines which cannot be parsed are handled according to `errors`: raise, skip, or collect (as in
+    parse_many), or yield, which yields a ParseFailure in their place. The errors and template are
+    checked when aparse_many is called, not when the first line is read.
+    """
+    if errors not in ('raise', 'skip', 'collect', 'yield'):
+        raise ValueError(f"errors must be one of ('raise', 'skip', 'collect', 'yield'), not {errors!r}")
+
+    if report is None:
+        report = ParseReport()
+
+    # fail fast on a bad template, rather than in a worker on the first batch
+    CleressianFormat.compile(template)
+
+    return _aparse_many(source, template, errors, report, batch_size, executor, prefetch, encoding, max_delay)
+
+
+async def _aparse_many(
+    source: AsyncIterable[Union[str, bytes]],
+    template: str,
+    errors: str,
+    report: ParseReport,
+    batch_size: int,
+    executor: Optional[concurrent.futures.Executor],
+    prefetch: int,
+    encoding: str,
+    max_delay: Optional[float]
+) -> AsyncIterator[Union[CleressianDate, ParseFailure]]:
+    """ Generate the dates (and failures) parsed from the source, for aparse_many. """
+    loop = asyncio.get_running_loop()
+    pending = collections.deque()
+    line_number = 1
+
+    async def _results(batch: List[str], first_line_number: int):
+        if executor is None:
+            await asyncio.sleep(0)
+            return _parse_batch(batch, template, first_line_number)
+        return await loop.run_in_executor(executor, _parse_batch, batch, template, first_line_number)
+
+    batches = _batches(source, batch_size, encoding, max_delay)
+    next_batch = None
+    exhausted = False
+
+    while True:
+        # read ahead (only when parsing elsewhere), keeping at most `prefetch` batches in flight, but
+        # never holding back a parsed batch to wait for the source
+        while not exhausted and len(pending) < (prefetch if executor is not None else 1):
+            if next_batch is None:
+                next_batch = asyncio.ensure_future(_next(batches))
+            if pending and not next_batch.done():
+                break
+
+            more, batch = await next_batch
+            next_batch = None
+            if not more:
+                exhausted = True
+                break
+
+            pending.append(asyncio.ensure_future(_results(batch, line_number)))
+            line_number += len(batch)
+
+        if not pending:
+            break
+
+        results, conflicts = await pending.popleft()
+        report.conflicts.update(conflicts)
+
+        for result in results:
+            if isinstance(result, ParseFailure):
+                if errors == 'raise':
+                    for future in pending:
+                        future.cancel()
+                    if next_batch is not None:
+                        next_batch.cancel()
+                    raise ValueError(f'line {result.line_number}: {result.error}')
+
+                report.skipped += 1
+                if errors == 'collect':
+                    report.failures.append(result)
+                elif errors == 'yield':
+                    yield result
+                continue
+
+            report.parsed += 1
+            yield result
+
+    if report.conflicts:
+        counts = ', '.join(f'{name} ({count})' for name, count in report.conflicts.items())
+        logging.warning(f'aparse_many: fields overwritten: {counts}')
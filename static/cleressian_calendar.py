@@ -0,0 +1,129 @@
+""" Month, year, and cycle layouts of the calendar, and text/HTML renderings of them (cf. the calendar module).
+
+A month is laid out as rows of `width` days (by default, two rows of 17: roughly the waxing and
+waning halves of the moon), padded with zeros at the end of the last row, so that Sirelle is
+
+    ((1, 2, ..., 17), (18, 19, ..., 34))
+
+and Neyu (6 or 7 days) is ((1, 2, 3, 4, 5, 6, 0, ..., 0),).
+
+Layouts only depend on the length of the month, so a whole grand cycle needs only a handful of
+distinct grids: these are computed once, and shared (as tuples) between every cycle and year.
+"""
+import functools
+import html
+from typing import Tuple
+
+from cleressian_date import CALENDAR, CleressianDate
+
+Grid = Tuple[Tuple[int, ...], ...]
+
+_CACHE_SIZE = 64
+
+
+def _check(cycle: int, year: int, month: int = 1, width: int = 17) -> Tuple[int, int, int, int]:
+    """ Validate (and normalise) a cycle, year, and month, as in CleressianDate, and a row width. """
+    cycle = CleressianDate._parse_int('cycle', cycle, 1, 23)
+    year = CleressianDate._parse_int('year', year, 1, 13)
+    width = CleressianDate._parse_int('width', width)
+    if width < 1:
+        raise ValueError(f'width must be positive, not {width!r}')
+    return cycle, year, CleressianDate._parse_month(month), width
+
+
+#############################################################################################
+# LAYOUTS ###################################################################################
+#############################################################################################
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _grid(length: int, width: int) -> Grid:
+    days = list(range(1, length + 1))
+    days += [0] * (-len(days) % width)
+    return tuple(tuple(days[i:i + width]) for i in range(0, len(days), width))
+
+
+def month_matrix(cycle: int, year: int, month: int, width: int = 17) -> Grid:
+    """ Return the layout of the given month of _:cycle:year, as rows of `width` days. """
+    cycle, year, month, width = _check(cycle, year, month, width)
+    return _grid(CleressianDate.days_in_month(cycle, year, month), width)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _year_grids(leap: bool, width: int) -> Tuple[Grid, ...]:
+    return tuple(_grid(CALENDAR.month_length[leap][month], width) for month in range(1, 11))
+
+
+def year_matrix(cycle: int, year: int, width: int = 17) -> Tuple[Grid, ...]:
+    """ Return the layouts of the ten months of _:cycle:year. """
+    cycle, year, _, width = _check(cycle, year, width=width)
+    return _year_grids(CleressianDate.is_leap_year(cycle, year), width)
+
+
+def cycle_matrix(cycle: int, width: int = 17) -> Tuple[Tuple[Grid, ...], ...]:
+    """ Return the layouts of the thirteen years of the given cycle. """
+    return tuple(year_matrix(cycle, year, width) for year in range(1, 14))
+
+
+#############################################################################################
+# TEXT RENDERING ############################################################################
+#############################################################################################
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _text_month(month: int, leap: bool, width: int) -> str:
+    rows = [' '.join(f'{d:2d}' if d else '  ' for d in row).rstrip() for row in _grid(CALENDAR.month_length[leap][month], width)]
+    return '\n'.join([CALENDAR.month_names[month].center(3 * width - 1).rstrip()] + rows)
+
+
+def text_month(cycle: int, year: int, month: int, width: int = 17) -> str:
+    """ Return the given month of _:cycle:year as text, with its name centered above its days. """
+    cycle, year, month, width = _check(cycle, year, month, width)
+    return _text_month(month, CleressianDate.is_leap_year(cycle, year), width)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _text_year(leap: bool, width: int) -> str:
+    return '\n\n'.join(_text_month(month, leap, width) for month in range(1, 11))
+
+
+def text_year(grand_cycle: int, cycle: int, year: int, width: int = 17) -> str:
+    """ Return the ten months of grand_cycle:cycle:year as text, under a G:C:Y heading. """
+    grand_cycle = CleressianDate._parse_int('grand_cycle', grand_cycle)
+    cycle, year, _, width = _check(cycle, year, width=width)
+    heading = f'{grand_cycle}:{cycle}:{year}'.center(3 * width - 1).rstrip()
+    return heading + '\n\n' + _text_year(CleressianDate.is_leap_year(cycle, year), width)
+
+
+#############################################################################################
+# HTML RENDERING ############################################################################
+#############################################################################################
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _html_month(month: int, leap: bool, width: int) -> str:
+    name = html.escape(CALENDAR.month_names[month])
+    rows = [
+        '<tr>' + ''.join(f'<td>{d}</td>' if d else '<td class="noday"></td>' for d in row) + '</tr>'
+        for row in _grid(CALENDAR.month_length[leap][month], width)
+    ]
+    return f'<table class="month {name.lower()}">\n<caption>{name}</caption>\n' + '\n'.join(rows) + '\n</table>'
+
+
+def html_month(cycle: int, year: int, month: int, width: int = 17) -> str:
+    """ Return the given month of _:cycle:year as an HTML table, captioned with its name. """
+    cycle, year, month, width = _check(cycle, year, month, width)
+    return _html_month(month, CleressianDate.is_leap_year(cycle, year), width)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _html_year(leap: bool, width: int) -> str:
+    return '\n'.join(_html_month(month, leap, width) for month in range(1, 11))
+
+
+def html_year(grand_cycle: int, cycle: int, year: int, width: int = 17) -> str:
+    """ Return the ten months of grand_cycle:cycle:year as HTML tables, in a div under a G:C:Y heading. """
+    grand_cycle = CleressianDate._parse_int('grand_cycle', grand_cycle)
+    cycle, year, _, width = _check(cycle, year, width=width)
+    return (
+        f'<div class="year">\n<h3>{grand_cycle}:{cycle}:{year}</h3>\n'
+        + _html_year(CleressianDate.is_leap_year(cycle, year), width)
+        + '\n</div>'
+    )
@@ -1,14 +1,123 @@
+from __future__ import annotations
+
+import collections
 import collections.abc
 import dataclasses
-import inspect
-import logging
+import functools
 import re
-from typing import Callable, Iterable, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# a year has 312 days, plus one for leap years (_:_:3k and _:23:13)
+_DAYS_PER_CYCLE = 13 * 312 + 4
+_DAYS_PER_GRAND_CYCLE = 23 * _DAYS_PER_CYCLE + 1
+
+# called with the name of each field overwritten while parsing (see cleressian_profile)
+_overwrite_hook: Optional[Callable[[str], None]] = None
+
+
+def _absolute_year(grand_cycle: int, cycle: int, year: int) -> int:
+    """ Return the absolute year (1:1:1 == year 1) of the given grand_cycle:cycle:year. """
+    return 23 * 13 * (grand_cycle - 1) + 13 * (cycle - 1) + year
+
+
+def _days_before_year(year: int) -> int:
+    """ Return the number of days from 1:1:1 Sirelle 1 to the first day of the given absolute year. """
+    q, r = divmod(year - 1, 299)
+    return q * _DAYS_PER_GRAND_CYCLE + CALENDAR.year_start[r]
+
+
+def _ordinal_to_absolute(ordinal: int) -> Tuple[int, int]:
+    """ Return the absolute (year, day) falling the given number of days after 1:1:1 Sirelle 1. """
+    q, d = divmod(ordinal, _DAYS_PER_GRAND_CYCLE)
+    r = CALENDAR.year_of_day(d)
+    return 299 * q + r + 1, d - CALENDAR.year_start[r] + 1
+
+
+def _ordinal_distance(lo: int, hi: int) -> Tuple[int, int]:
+    """ Return the (years, days) from the lo-th to the hi-th day (lo <= hi), as in CleressianDate.distance. """
+    if lo == hi:
+        return 0, 0
+
+    ax, ad = _ordinal_to_absolute(lo)
+    bx, bd = _ordinal_to_absolute(hi)
+
+    # get the day to line up
+    if ad < bd:
+        return bx - ax, bd - ad
+
+    # otherwise, run to the end of lo's year and line up the day in the next one
+    diy = _days_before_year(ax + 1) - _days_before_year(ax)
+    return bx - ax - 1, bd + (diy - ad)
+
+
+def _ordinal_shift(ordinal: int, years: int, days: int) -> int:
+    """ Return the ordinal which is (years, days) from the given one, reversing _ordinal_distance. """
+    year, day = _ordinal_to_absolute(ordinal)
+    shifted = year + years
+
+    # as in distance, if the day of the year doesn't line up in the shifted year, the days are counted
+    # to the end of the starting year, and then on into the year after the shifted one
+    if (years, days) > (0, 0) and day + days > _days_before_year(shifted + 1) - _days_before_year(shifted):
+        return _days_before_year(shifted + 1) + day + days - (_days_before_year(year + 1) - _days_before_year(year)) - 1
+
+    return _days_before_year(shifted) + day + days - 1
+
+
+class CalendarTables:
+    """ Lookup tables for the calendar, which repeats itself every grand cycle of 23 * 13 = 299 years.
+
+    Years are indexed by their position r = 0, 1, ..., 298 in the grand cycle, so that _:C:Y is the
+    year r = 13(C-1) + (Y-1). Months and days of the year are indexed from 1, as in CleressianDate.
+    """
+
+    def __init__(self, months: List[str]):
+        # whether each year of the grand cycle is a leap year: _:_:3k, and _:23:13
+        self.leap = [(r % 13 + 1) % 3 == 0 or r == 298 for r in range(299)]
+        self.leap_by_cycle_year = {(r // 13 + 1, r % 13 + 1): leap for r, leap in enumerate(self.leap)}
+
+        # the number of days from the start of the grand cycle to the start of each year (and to its end)
+        self.year_start = [0]
+        for leap in self.leap:
+            self.year_start.append(self.year_start[-1] + 312 + leap)
+
+        # the number of days in each month, in common and leap years
+        self.month_length = ([0] + [34] * 9 + [6], [0] + [34] * 9 + [7])
+
+        # the number of days from the start of the year to the start of each month
+        self.month_start = [0] + [34 * m for m in range(10)]
+
+        # the (month, day) of each day of the year
+        self.month_day = [(0, 0)] + [(1 + d // 34, 1 + d % 34) for d in range(313)]
+
+        # month numbers by name (and by number), and names and abbreviations by number
+        self.month_names = list(months)
+        self.month_abbreviations = [name[:3] for name in months]
+        self.month_numbers = {name: m for m, name in enumerate(months) if name}
+        self.month_numbers.update({m: m for m in range(1, len(months))})
+        self.abbreviation_numbers = {abbr: m for m, abbr in enumerate(self.month_abbreviations) if abbr}
+
+    def year_of_day(self, day: int) -> int:
+        """ Return the index of the year in which the given day (counted from 0) of the grand cycle falls.
+
+        Every year has 312 or 313 days, so the index is either day // 313 or one more than that.
+        """
+        r = day // 313
+        return r + 1 if self.year_start[r + 1] <= day else r
 
 
 def _reprify(cls):
-    param_names = tuple(inspect.signature(cls).parameters)
-    cls.__repr__ = lambda self: f'{cls.__name__}(' + ', '.join(f'{k}={getattr(self, k)!r}' for k in param_names) + ')'
+    param_names = None
+
+    def __repr__(self):
+        # look up the constructor's parameters on first use, so that importing the module doesn't need inspect
+        nonlocal param_names
+        if param_names is None:
+            import inspect
+            param_names = tuple(inspect.signature(cls).parameters)
+
+        return f'{cls.__name__}(' + ', '.join(f'{k}={getattr(self, k)!r}' for k in param_names) + ')'
+
+    cls.__repr__ = __repr__
     return cls
 
 
@@ -28,8 +137,18 @@ class AbsoluteDate:
         return True
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(order=True)
 class DateDelta:
+    """ A number of years and days, as returned by CleressianDate.distance (and subtracting dates).
+
+    Deltas add (so sum() works on them), subtract, and scale componentwise.
+
+    Deltas compare as plain (years, days) pairs, which is only meaningful for deltas normalised
+    against the same anchor (as those from subtracting dates with a common start are): then, and
+    only then, it is the order of their total_days. Otherwise, it is not the order of their lengths;
+    e.g., DateDelta(0, 400) < DateDelta(1, 0), though 400 days are more than a year. To order
+    arbitrary deltas, compare their total_days from an anchor, or normalize them against it first.
+    """
     years: int = 0
     days: int = 0
 
@@ -39,9 +158,79 @@ class DateDelta:
     def __mul__(self, r):
         return self.__class__(self.years * r, self.days * r)
 
+    def __add__(self, other: 'DateDelta') -> 'DateDelta':
+        if not isinstance(other, DateDelta):
+            return NotImplemented
+        return self.__class__(self.years + other.years, self.days + other.days)
+
+    def __radd__(self, other: int) -> 'DateDelta':
+        # so that sum(deltas) works, starting from 0
+        if isinstance(other, int) and other == 0:
+            return self.__class__(self.years, self.days)
+        return NotImplemented
+
+    def __sub__(self, other: 'DateDelta') -> 'DateDelta':
+        if not isinstance(other, DateDelta):
+            return NotImplemented
+        return self.__class__(self.years - other.years, self.days - other.days)
+
+    def __neg__(self) -> 'DateDelta':
+        return self.__class__(-self.years, -self.days)
+
+    def total_days(self, anchor: 'CleressianDate') -> int:
+        """ Return the number of days spanned by this delta from the anchor date (negative if it runs backwards).
+
+        This reverses subtraction: for dates x and y, (y - x).total_days(x) == y.toordinal() - x.toordinal(),
+        except that distance gives the same delta to a leap day and the new year's day after it, of which
+        the leap day is taken. (CleressianDate.__add__, by contrast, shifts by the years before the days,
+        so x + (y - x) can be a day away from y.) No dates are built, so this is cheap to call in bulk.
+        """
+        if not isinstance(anchor, CleressianDate):
+            raise TypeError(f'anchor must be a CleressianDate, not {anchor!r}')
+        return _ordinal_shift(anchor._ordinal, self.years, self.days) - anchor._ordinal
+
+    def normalize(self, anchor: 'CleressianDate') -> 'DateDelta':
+        """ Return the delta spanning the same days from the anchor, written as subtracting the dates would write it.
+
+        For example, DateDelta(0, 400) from 1:1:1 Sirelle 1 is DateDelta(1, 88). The result has the same
+        total_days from the anchor, except where it lands on the ambiguous delta described there.
+        """
+        if not isinstance(anchor, CleressianDate):
+            raise TypeError(f'anchor must be a CleressianDate, not {anchor!r}')
+
+        ordinal = anchor._ordinal
+        other = _ordinal_shift(ordinal, self.years, self.days)
+        if other >= ordinal:
+            return self.__class__(*_ordinal_distance(ordinal, other))
+
+        years, days = _ordinal_distance(other, ordinal)
+        return self.__class__(-years, -days)
+
+
+@dataclasses.dataclass
+class ParseFailure:
+    line_number: int
+    line: str
+    error: str
+
+
+@dataclasses.dataclass
+class ParseReport:
+    """ Running totals from CleressianDate.parse_many """
+    parsed: int = 0
+    skipped: int = 0
+    failures: List[ParseFailure] = dataclasses.field(default_factory=list)
+    conflicts: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+
 
 @_reprify
 class CleressianDate:
+    """ A date in the Cleressian calendar, written G:C:Y M D.
+
+    Dates are immutable (and so hashable), and they compare by their ordinal (see toordinal).
+    """
+    __slots__ = ('_grand_cycle', '_cycle', '_year', '_month', '_day', '_ordinal')
+
     MONTHS = ['', 'Sirelle', 'Tiri', 'Enna', 'Fis', 'Klesni', 'Pelio', 'Kria', 'Sui', 'Brilia', 'Neyu']
 
     def __init__(
@@ -52,88 +241,60 @@ class CleressianDate:
         month: Union[int, str] = 1,
         day: int = 1
     ):
-        self.grand_cycle = grand_cycle
-        self.cycle = cycle
-        self.year = year
-        self.month = month
-        self.day = day
+        grand_cycle = self._parse_int('grand_cycle', grand_cycle)
+        cycle = self._parse_int('cycle', cycle, 1, 23)
+        year = self._parse_int('year', year, 1, 13)
+        month = self._parse_month(month)
+        day = self._parse_int('day', day, 1, CALENDAR.month_length[self.is_leap_year(cycle, year)][month])
+
+        self._grand_cycle = grand_cycle
+        self._cycle = cycle
+        self._year = year
+        self._month = month
+        self._day = day
+        self._ordinal = (
+            (grand_cycle - 1) * _DAYS_PER_GRAND_CYCLE
+            + CALENDAR.year_start[13 * (cycle - 1) + year - 1]
+            + CALENDAR.month_start[month] + day - 1
+        )
+
+    @classmethod
+    def _trusted(cls, grand_cycle: int, cycle: int, year: int, month: int, day: int, ordinal: int) -> 'CleressianDate':
+        """ Construct a date from values which are already known to be valid, skipping validation. """
+        self = object.__new__(cls)
+        self._grand_cycle = grand_cycle
+        self._cycle = cycle
+        self._year = year
+        self._month = month
+        self._day = day
+        self._ordinal = ordinal
+        return self
 
     #############################################################################################
     # ACCESSORS #################################################################################
     #############################################################################################
 
     @property
-    def grand_cycle(self):
+    def grand_cycle(self) -> int:
         return self._grand_cycle
 
-    @grand_cycle.setter
-    def grand_cycle(self, val):
-        try:
-            val = int(float(val))
-        except ValueError:
-            raise TypeError(f'grand_cycle must be interpretable as an integer, not {val!r}')
-
-        self._grand_cycle = val
-
     @property
-    def cycle(self):
+    def cycle(self) -> int:
         return self._cycle
 
-    @cycle.setter
-    def cycle(self, val):
-        try:
-            val = int(float(val))
-        except ValueError:
-            raise TypeError(f'cycle must be interpretable as an integer, not {val!r}')
-
-        if not (1 <= val <= 23):
-            raise ValueError(f'cycle must be between 1 and 23, not {val!r}')
-
-        self._cycle = val
-
     @property
-    def year(self):
+    def year(self) -> int:
         return self._year
 
-    @year.setter
-    def year(self, val):
-        try:
-            val = int(float(val))
-        except ValueError:
-            raise TypeError(f'year must be interpretable as an integer, not {val!r}')
-
-        if not (1 <= val <= 13):
-            raise ValueError(f'year must be between 1 and 13, not {val!r}')
-
-        self._year = val
-
     @property
-    def month(self):
+    def month(self) -> int:
         """ Return the month NUMBER """
         return self._month
 
-    @month.setter
-    def month(self, val):
-        val = self._parse_month(val)
-        self._month = val
-
     @property
-    def day(self):
+    def day(self) -> int:
         return self._day
 
-    @day.setter
-    def day(self, val):
-        try:
-            val = int(float(val))
-        except ValueError:
-            raise TypeError(f'year must be interpretable as an integer, not {val!r}')
-
-        daycap = self.days_in_month(self.cycle, self.year, self.month)
-        if not (1 <= val <= daycap):
-            raise ValueError(f'year must be between 1 and {daycap}, not {val!r}')
-
-        self._day = val
-
     @property
     def month_name(self) -> str:
         return self.MONTHS[self.month]
@@ -142,9 +303,28 @@ class CleressianDate:
     # UTILITY METHODS ###########################################################################
     #############################################################################################
 
+    @staticmethod
+    def _parse_int(name: str, val: int, lo: int = None, hi: int = None) -> int:
+        """ Parse the given value into an integer, checking that it lies between lo and hi (if given). """
+        if type(val) is not int:
+            try:
+                val = int(float(val))
+            except ValueError:
+                raise TypeError(f'{name} must be interpretable as an integer, not {val!r}')
+
+        if lo is not None and not (lo <= val <= hi):
+            raise ValueError(f'{name} must be between {lo} and {hi}, not {val!r}')
+
+        return val
+
     @staticmethod
     def _parse_month(val: Union[int, str]) -> int:
         """ Parse the given value into the corresponding month number. """
+        if type(val) is int or type(val) is str:
+            month = CALENDAR.month_numbers.get(val)
+            if month is not None:
+                return month
+
         try:
             month = int(float(val))
             if 1 <= month <= 10:
@@ -164,6 +344,10 @@ class CleressianDate:
     @staticmethod
     def is_leap_year(cycle: int, year: int) -> bool:
         """ Return true if _:cycle:year defines a leap year; false, otherwise """
+        leap = CALENDAR.leap_by_cycle_year.get((cycle, year))
+        if leap is not None:
+            return leap
+
         if year % 3 == 0:
             # _:_:3k is a leap year
             return True
@@ -179,17 +363,13 @@ class CleressianDate:
         """ Return the number of days in the given month"""
         month = CleressianDate._parse_month(month)
 
-        if month == 10:
-            # only month 10 has weird numbers of days
-            return 6 + int(CleressianDate.is_leap_year(cycle, year))
-
-        # all other months have 34 days
-        return 34
+        # only month 10 has weird numbers of days
+        return CALENDAR.month_length[CleressianDate.is_leap_year(cycle, year)][month]
 
     @staticmethod
     def days_in_year(cycle: int, year: int) -> int:
-        """ Return the number of years in the given year. """
-        return 313 if CleressianDate.is_leap_year(cycle, year) else 312
+        """ Return the number of days in the given year. """
+        return 312 + CleressianDate.is_leap_year(cycle, year)
 
     def replace(self, **repl) -> 'CleressianDate':
         """ Create a copy of this date with the given replacements """
@@ -207,18 +387,60 @@ class CleressianDate:
 
     def copy(self) -> 'CleressianDate':
         """ Create a copy of this date. """
-        return self.replace()
+        return self._trusted(self._grand_cycle, self._cycle, self._year, self._month, self._day, self._ordinal)
 
     def __copy__(self) -> 'CleressianDate':
         return self.copy()
 
-    def __deepcopy__(self) -> 'CleressianDate':
+    def __deepcopy__(self, memo) -> 'CleressianDate':
         return self.copy()
 
+    def __reduce__(self):
+        return self.__class__, (self._grand_cycle, self._cycle, self._year, self._month, self._day)
+
+    @staticmethod
+    def _parse_offset(other: Union[int, Iterable[int]]) -> Tuple[int, int]:
+        """ Parse the given offset into a number of (years, days). A bare integer is a number of days. """
+        try:
+            return 0, int(float(other))
+        except (ValueError, TypeError):
+            if isinstance(other, collections.abc.Iterable):
+                try:
+                    years, days = [int(float(x)) for x in other]
+                    return years, days
+                except (ValueError, TypeError):
+                    pass
+
+        raise TypeError(f'other must be one of (int, Iterable[int, int], CleressianDate), not {other!r}')
+
     #############################################################################################
     # ABSOLUTE DATE HANDLING ####################################################################
     #############################################################################################
 
+    @classmethod
+    def fromordinal(cls, ordinal: int) -> 'CleressianDate':
+        """ An alternate constructor using the number of days since 1:1:1 Sirelle 1 (which is day 0). """
+        grand_cycle, d = divmod(ordinal, _DAYS_PER_GRAND_CYCLE)
+        r = CALENDAR.year_of_day(d)
+        month, day = CALENDAR.month_day[d - CALENDAR.year_start[r] + 1]
+        return cls._trusted(grand_cycle + 1, r // 13 + 1, r % 13 + 1, month, day, ordinal)
+
+    @classmethod
+    def _from_valid_absolute_date(cls, year: int, day: int, ordinal: int) -> 'CleressianDate':
+        """ Construct the date at the given (valid) absolute year and day, and ordinal, skipping validation. """
+        grand_cycle, r = divmod(year - 1, 299)
+        month, day = CALENDAR.month_day[day]
+        return cls._trusted(grand_cycle + 1, r // 13 + 1, r % 13 + 1, month, day, ordinal)
+
+    def toordinal(self) -> int:
+        """ Return the number of days since 1:1:1 Sirelle 1, so that 1:1:1 Sirelle 1 is day 0.
+
+        For all CleressianDate objects `a` and integers `n`, we have
+            CleressianDate.fromordinal(a.toordinal()) == a
+            (a + n).toordinal() == a.toordinal() + n
+        """
+        return self._ordinal
+
     @classmethod
     def from_absolute_date(cls, year: int = 1, day: int = 1) -> 'CleressianDate':
         """ An alternate constructor using the absolute year and day.
@@ -232,16 +454,24 @@ class CleressianDate:
         by identical reasoning that C = floor((y+12)/13). Since we loop the cycle count in such
         a way that C=24 is equivalent to C=1, we can simply find C (mod 23) and remember to
         change 0 → 23.
+
+        Every month but Neyu has 34 days, so the day of the year D falls in the month
+        M = floor((D-1)/34) + 1, on the day D - 34(M-1).
         """
+        if type(year) is int and type(day) is int:
+            start = _days_before_year(year)
+            if 1 <= day <= _days_before_year(year + 1) - start:
+                return cls._from_valid_absolute_date(year, day, start + day - 1)
+
         g = (year + 298) // 299
         c = ((year + 12) // 13) % 23
         y = year % 13
-        m = 1 + day // 34
-        d = day % 34
+        m = 1 + (day - 1) // 34
+        d = 1 + (day - 1) % 34
 
         # the "or _" calcs are used to emulate 1-indexing
         try:
-            return cls(g, c or 23, y or 13, m or 10, d or 34)
+            return cls(g, c or 23, y or 13, m, d)
         except Exception as e:
             raise ValueError(f'invalid absolute date: ({year!r}, {day!r})') from e
 
@@ -253,8 +483,8 @@ class CleressianDate:
             CleressianDate.from_absolute_date(year, day).to_absolute_date() == (year, day)
         """
         return AbsoluteDate(
-            year=23 * 13 * (self.grand_cycle - 1) + 13 * (self.cycle - 1) + self.year,
-            day=34 * (self.month - 1) + self.day
+            year=_absolute_year(self.grand_cycle, self.cycle, self.year),
+            day=CALENDAR.month_start[self.month] + self.day
         )
 
     #############################################################################################
@@ -284,29 +514,7 @@ class CleressianDate:
         if not isinstance(template, str):
             raise TypeError(f'template must be a string, not {template!r}')
 
-        # replace the two shortcut tags
-        template = template.replace("%x", "%g:%c:%y %B %d").replace("%X", "%04Y.%03j")
-
-        # handle numeric lookups
-        numeric = dict(
-            g=self.grand_cycle, c=self.cycle, y=self.year,
-            m=self.month, d=self.day,
-            j=self.to_absolute_date().day,
-            Y=self.to_absolute_date().year
-        )
-
-        for k, v in numeric.items():
-            match = re.search(r'%(0(\d+))?' + k, template)
-            if match is not None:
-                length = int(match.group(2) or '1')  # always force a width >= 1
-                template = template.replace(match.group(0), str(v).zfill(length))
-
-        # handle nonnumeric lookups
-        nonnumeric = {'%b': self.month_name[:3], '%B': self.month_name, '%%': '%'}
-        for k, v in nonnumeric.items():
-            template = template.replace(k, v)
-
-        return template
+        return CleressianFormat.compile(template).format(self)
 
     def __str__(self) -> str:
         return self.strftime(template="%x")
@@ -318,60 +526,339 @@ class CleressianDate:
         if not isinstance(template, str):
             raise TypeError(f'template must be a string, not {template!r}')
 
-        # handle the two shortcut tags
-        pattern: str = template.replace("%x", "%g:%c:%y %B %d").replace("%X", "%04Y.%03j")
+        return CleressianFormat.compile(template).parse(date_str, cls)
+
+    @classmethod
+    def parse_any(cls, date_str: str, templates: Iterable[str] = ("%x", "%X")) -> 'CleressianDate':
+        """ Parse the string following the first of the given templates which it matches, as in strptime.
+
+        All of the templates are combined into one regex (see CleressianMultiFormat), rather than
+        trying each template in turn. A single template may also be given as a string.
+        """
+        if isinstance(templates, str):
+            templates = (templates,)
+        return CleressianMultiFormat.compile(tuple(templates)).parse(date_str, cls)
+
+    @classmethod
+    def parse_many(
+        cls,
+        lines: Iterable[str],
+        template: Union[str, Iterable[str]] = "%x",
+        errors: str = "raise",
+        report: Optional['ParseReport'] = None,
+        sample: int = 100
+    ) -> Iterator['CleressianDate']:
+        """ Lazily parse each line (e.g., of a file) following the given template, as in strptime.
+
+        The template may also be a sequence of templates, as in parse_any, in which case the template
+        followed by most of the first `sample` lines is tried first on each of the lines after them.
+
+        Trailing newlines are stripped, and blank lines are ignored. Lines which cannot be parsed are
+        handled according to `errors`:
+
+        raise       raise a ValueError naming the line number (the default)
+        skip        drop the line, counting it in `report.skipped`
+        collect     as skip, but also record the line in `report.failures`
+
+        Rather than logging a warning for each line in which one field overwrites another, these are
+        counted by field name in `report.conflicts`, and a single summary warning is logged at the end.
+
+        The errors and template are checked when parse_many is called, not when the first line is read.
+        """
+        parse = cls._line_parser(template, errors, sample)
+        if report is None:
+            report = ParseReport()
+
+        return cls._parse_lines(lines, parse, errors, report)
+
+    @staticmethod
+    def _line_parser(template: Union[str, Iterable[str]], errors: str, sample: int) -> Callable:
+        """ Check the arguments of parse_many, and return the function which parses each line. """
+        if errors not in ('raise', 'skip', 'collect'):
+            raise ValueError(f"errors must be one of ('raise', 'skip', 'collect'), not {errors!r}")
+
+        if isinstance(template, str):
+            return CleressianFormat.compile(template).parse
+        return CleressianMultiFormat.compile(tuple(template)).inferring_parser(sample)
+
+    @classmethod
+    def _parse_lines(cls, lines: Iterable[str], parse: Callable, errors: str, report: 'ParseReport') -> Iterator['CleressianDate']:
+        """ Generate the dates parsed from each line, for parse_many. """
+        for line_number, line in enumerate(lines, start=1):
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+
+            try:
+                date = parse(line, cls, report.conflicts)
+            except (ValueError, TypeError) as e:
+                if errors == 'raise':
+                    raise ValueError(f'line {line_number}: {e}') from e
+
+                report.skipped += 1
+                if errors == 'collect':
+                    report.failures.append(ParseFailure(line_number, line, str(e)))
+                continue
+
+            report.parsed += 1
+            yield date
+
+        if report.conflicts:
+            import logging
+            counts = ', '.join(f'{name} ({count})' for name, count in report.conflicts.items())
+            logging.warning(f'parse_many: fields overwritten: {counts}')
+
+    @classmethod
+    def parse_file(
+        cls,
+        path: str,
+        template: Union[str, Iterable[str]] = "%x",
+        errors: str = "raise",
+        report: Optional['ParseReport'] = None,
+        encoding: str = "utf-8",
+        sample: int = 100
+    ) -> Iterator['CleressianDate']:
+        """ Lazily parse each line of the file at the given path, as in parse_many.
+
+        As there, the errors and template are checked straight away, but the file is only opened once
+        the first line is read.
+        """
+        parse = cls._line_parser(template, errors, sample)
+        if report is None:
+            report = ParseReport()
+
+        def _dates():
+            with open(path, encoding=encoding) as f:
+                yield from cls._parse_lines(f, parse, errors, report)
+
+        return _dates()
+
+    #############################################################################################
+    # COMPARISON METHODS ########################################################################
+    #############################################################################################
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CleressianDate):
+            return False
+        return self._ordinal == other._ordinal
+
+    def __hash__(self) -> int:
+        return hash(self._ordinal)
+
+    def _check_comparable(self, other, op: str):
+        if not isinstance(other, CleressianDate):
+            a, b = self.__class__.__name__, other.__class__.__name__
+            raise TypeError(f"{op!r} not supported between instances of {a!r} and {b!r}")
+
+    def __lt__(self, other) -> bool:
+        """ Return True if both are CleressianDates and `self` occurs before `other` """
+        self._check_comparable(other, '<')
+        return self._ordinal < other._ordinal
+
+    def __le__(self, other) -> bool:
+        self._check_comparable(other, '<=')
+        return self._ordinal <= other._ordinal
+
+    def __gt__(self, other) -> bool:
+        self._check_comparable(other, '>')
+        return self._ordinal > other._ordinal
+
+    def __ge__(self, other) -> bool:
+        self._check_comparable(other, '>=')
+        return self._ordinal >= other._ordinal
+
+    #############################################################################################
+    # ARITHMETIC METHODS ########################################################################
+    #############################################################################################
+
+    def __add__(self, other: Union[int, Iterable[int]]) -> 'CleressianDate':
+        """ Return the date a given number of years and days in the future.
+        If `other` is a single integer, interpret it as a number of days.
+        """
+        years, days = self._parse_offset(other)
+
+        # shift the year first, keeping the day of the year, and then count the days from there
+        year, day = self.to_absolute_date()
+        return self.fromordinal(_days_before_year(year + years) + day + days - 1)
+
+    def __sub__(self, other: Union[int, Iterable[int], 'CleressianDate']) -> Union[DateDelta, 'CleressianDate']:
+        """ Find the (1) number of years/days between two dates (2) date a given number of years/days in the past
+
+        If `other` is another CleressianDate, do option (1).
+        Otherwise, `other` should be an integer or a 2-iterable of ints. A bare int is interpreted as # of days.
+        """
+        if isinstance(other, CleressianDate):
+            # find the number of years and days between the two dates
+            cls = self.__class__
+            distance = cls.distance(self, other)
+            return distance if self > other else distance * -1
+
+        # otherwise, calculate a date some number of years and days in the past
+        years, days = self._parse_offset(other)
+        return self + (-years, -days)
+
+    @staticmethod
+    def distance(x: 'CleressianDate', y: 'CleressianDate') -> DateDelta:
+        """ Return the number of years and days between two dates, regardless of order. """
+        if not isinstance(x, CleressianDate) or not isinstance(y, CleressianDate):
+            raise TypeError('arguments must be CleressianDate onjects')
+
+        ox, oy = x._ordinal, y._ordinal
+        return DateDelta(*_ordinal_distance(min(ox, oy), max(ox, oy)))
 
-        # go through the template and replace %_ with the proper regex structures
-        def _repl(key: str) -> Callable[[re.Match], str]:
-            if key in set('gcymdjY'):
-                # numeric key
-                return lambda match, key=key: f'(?P<{key}>' + r'\d{' + (match.group(1) or '1') + r',})'
+
+CALENDAR = CalendarTables(CleressianDate.MONTHS)
+
+
+class CleressianFormat:
+    """ A strftime/strptime template, compiled once so that it can be reused for many dates.
+
+    The template is broken into its %_ tags (see CleressianDate.strftime) and literal text,
+    from which we build both a regex to parse date strings and a str.format template to
+    render dates. CleressianFormat.compile shares compiled formats through a bounded cache.
+    """
+    SHORTCUTS = {'x': '%g:%c:%y %B %d', 'X': '%04Y.%03j'}
+    # compiled (and cached) by the re module on first use, rather than at import
+    TAG = r'%(?:(0\d+)?([gcymdjY])|([bBxX%]))'
+
+    # how to find the value of each tag from a date
+    FIELDS: Dict[str, Callable[['CleressianDate'], Union[int, str]]] = {
+        'g': lambda date: date.grand_cycle,
+        'c': lambda date: date.cycle,
+        'y': lambda date: date.year,
+        'm': lambda date: date.month,
+        'd': lambda date: date.day,
+        'j': lambda date: date.to_absolute_date().day,
+        'Y': lambda date: date.to_absolute_date().year,
+        'b': lambda date: CALENDAR.month_abbreviations[date.month],
+        'B': lambda date: date.month_name,
+    }
+
+    def __init__(self, template: str = "%x"):
+        if not isinstance(template, str):
+            raise TypeError(f'template must be a string, not {template!r}')
+
+        self.template = template
+
+        fmt, keys = [], []
+        for literal, key, width in self._tokens(template):
+            if literal is not None:
+                fmt.append(literal.replace('{', '{{').replace('}', '}}'))
+                continue
+
+            fmt.append('{' + key + (f':0{width}d' if width > 1 else '') + '}')
+            if key not in keys:
+                keys.append(key)
+
+        self._regex = re.compile(self._pattern())
+        self._format = ''.join(fmt)
+        self._getters = tuple((key, self.FIELDS[key]) for key in keys)
+
+    def _pattern(self, prefix: str = '') -> str:
+        """ Return the regex which parses this format, naming the group for each tag by its key (after the prefix). """
+        pattern, keys = [], set()
+        for literal, key, width in self._tokens(self.template):
+            if literal is not None:
+                pattern.append(re.escape(literal))
+            elif key in keys:
+                # the same field must hold the same text every time it appears
+                pattern.append(f'(?P={prefix}{key})')
             elif key == 'b':
-                # short month names
-                names = '|'.join(month[:3] for month in cls.MONTHS[1:])
-                return lambda _: f'(?P<b>{names})'
+                pattern.append(f'(?P<{prefix}b>' + '|'.join(month[:3] for month in CleressianDate.MONTHS[1:]) + ')')
             elif key == 'B':
-                # long month names
-                names = '|'.join(cls.MONTHS[1:])
-                return lambda _: f'(?P<B>{names})'
+                pattern.append(f'(?P<{prefix}B>' + '|'.join(CleressianDate.MONTHS[1:]) + ')')
+            else:
+                pattern.append(f'(?P<{prefix}{key}>' + r'\d{' + str(width) + r',})')
+
+            if key is not None:
+                keys.add(key)
+
+        return ''.join(pattern)
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(cls, template: str = "%x") -> 'CleressianFormat':
+        """ Return the compiled format for the given template, reusing a cached one if possible. """
+        return cls(template)
+
+    @classmethod
+    def _tokens(cls, template: str) -> Iterator[Tuple[Optional[str], Optional[str], int]]:
+        """ Split the template into (literal, None, 0) and (None, key, width) tokens, expanding %x and %X. """
+        pos = 0
+        for match in re.finditer(cls.TAG, template):
+            if match.start() > pos:
+                yield template[pos:match.start()], None, 0
+
+            width, key = match.group(1), match.group(2) or match.group(3)
+            if key in cls.SHORTCUTS:
+                yield from cls._tokens(cls.SHORTCUTS[key])
             elif key == '%':
                 # literal percent sign
-                return lambda _: '%'
+                yield '%', None, 0
             else:
-                raise ValueError(f'invalid key {key!r}')
+                # always force a width >= 1
+                yield None, key, int(width or '1')
 
-        # numeric tags
-        for key in set('gcymdjY'):
-            pattern = re.sub(r'%(0\d+)?' + key, _repl(key), pattern)
+            pos = match.end()
 
-        # nonnumeric tags
-        for key in set('bB%'):
-            pattern = re.sub(f'%{key}', _repl(key), pattern)
+        if pos < len(template):
+            yield template[pos:], None, 0
 
-        # ---------------------------------------------------------------------------------------------
-        # At this point, `pattern` contains the *actual* regex we can use to parse the date string.
-        # ---------------------------------------------------------------------------------------------
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.template!r})'
 
-        match = re.fullmatch(pattern, date_str)
+    def format(self, date: 'CleressianDate') -> str:
+        """ Convert the date object to a string following this format. """
+        return self._format.format_map({key: get(date) for key, get in self._getters})
+
+    def parse(self, date_str: str, cls: type = None, conflicts: collections.Counter = None) -> 'CleressianDate':
+        """ Parse the string into a date (of the given CleressianDate subclass) following this format.
+
+        If one field overwrites another (e.g., %B and %j disagree on the month), a warning is logged,
+        unless `conflicts` is given, in which case the name of the overwritten field is counted there.
+        """
+        if not isinstance(date_str, str):
+            raise TypeError(f'date_str must be a string, not {date_str!r}')
+
+        match = self._regex.fullmatch(date_str)
         if match is None:
-            raise ValueError(f'Date data {date_str!r} does not match format {template!r}')
+            raise ValueError(f'Date data {date_str!r} does not match format {self.template!r}')
+
+        return self._build(cls or CleressianDate, match.groupdict(), conflicts)
+
+    @staticmethod
+    def _build(cls: type, fields: Dict[str, str], conflicts: collections.Counter = None) -> 'CleressianDate':
+        """ Construct the date described by the matched fields of a date string. """
+        if 'Y' not in fields and 'j' not in fields and ('m' in fields) + ('b' in fields) + ('B' in fields) <= 1:
+            # no field can overwrite another, so we can build the date directly
+            month = fields.get('B') or fields.get('m') or 1
+            if 'b' in fields:
+                month = CALENDAR.abbreviation_numbers[fields['b']]
+
+            return cls(
+                grand_cycle=fields.get('g', 1),
+                cycle=fields.get('c', 1),
+                year=fields.get('y', 1),
+                month=month,
+                day=fields.get('d', 1)
+            )
 
         kwargs = {}
 
         # first check for absolute dates
         sentinel = cls.from_absolute_date(1, 1)
 
-        if 'Y' in match.groupdict().keys():
-            absyear = int(match.group('Y'))
+        if 'Y' in fields:
+            absyear = int(fields['Y'])
             sentinel = cls.from_absolute_date(absyear, 1)
 
             kwargs['grand_cycle'] = sentinel.grand_cycle
             kwargs['cycle'] = sentinel.cycle
             kwargs['year'] = sentinel.year
 
-        if 'j' in match.groupdict().keys():
-            absday = int(match.group('j'))
-            tmp = cls.from_absolute_date(1, absday)
+        if 'j' in fields:
+            absday = int(fields['j'])
+            tmp = cls.from_absolute_date(int(fields.get('Y', 1)), absday)
             sentinel = sentinel.replace(month=tmp.month, day=tmp.day)
 
             kwargs['month'] = sentinel.month
@@ -380,13 +867,13 @@ class CleressianDate:
         # now check for individual values
         def _update(key: str, name: str):
             nonlocal sentinel
-            if key not in match.groupdict().keys():
+            if key not in fields:
                 return
 
-            raw_value = match.group(key)
+            raw_value = fields[key]
             if key == 'b':
                 # find the index of the month with that abbreviation
-                val = [s[:3] for s in cls.MONTHS].index(raw_value)
+                val = CALENDAR.abbreviation_numbers[raw_value]
             elif key == 'B':
                 # just leave the month name intact
                 val = raw_value
@@ -399,10 +886,17 @@ class CleressianDate:
                 tmp = sentinel.replace(**{name: val})
 
                 if tmp != sentinel:
-                    fmt = "%04Y (%g:%c:%y)" if key in 'gcy' else ".%03j (%B %02d)"
-                    prev = sentinel.strftime(fmt)
-                    curr = tmp.strftime(fmt)
-                    logging.warning(f'strptime: {name} overwritten: {prev} -> {curr}')
+                    if _overwrite_hook is not None:
+                        _overwrite_hook(name)
+
+                    if conflicts is not None:
+                        conflicts[name] += 1
+                    else:
+                        import logging
+                        fmt = "%04Y (%g:%c:%y)" if key in 'gcy' else ".%03j (%B %02d)"
+                        prev = sentinel.strftime(fmt)
+                        curr = tmp.strftime(fmt)
+                        logging.warning(f'strptime: {name} overwritten: {prev} -> {curr}')
 
             sentinel = sentinel.replace(**{name: val})
             kwargs[name] = val
@@ -424,125 +918,286 @@ class CleressianDate:
 
         return cls(**kwargs)
 
-    #############################################################################################
-    # COMPARISON METHODS ########################################################################
-    #############################################################################################
 
-    def __eq__(self, other) -> int:
-        if not isinstance(other, CleressianDate):
-            return False
-        return repr(self) == repr(other)
+class CleressianMultiFormat:
+    """ Several templates, combined into one regex which parses a string following any of them.
 
-    def __lt__(self, other) -> int:
-        """ Return True if both are CleressianDates and `self` occurs before `other` """
-        if not isinstance(other, CleressianDate):
-            a, b = self.__class__.__name__, other.__class__.__name__
-            raise TypeError(f"'<' not supported between instances of {a!r} and {b!r}")
-        return tuple(self.to_absolute_date()) < tuple(other.to_absolute_date())
+    Each template's regex is an alternative, tried in the order given, with its groups prefixed by
+    its position so that the fields of the template which matched can be recovered.
+    """
 
-    #############################################################################################
-    # ARITHMETIC METHODS ########################################################################
-    #############################################################################################
-
-    def __add__(self, other: Union[int, Iterable[int]]) -> 'CleressianDate':
-        """ Return the date a given number of years and days in the future.
-        If `other` is a single integer, interpret it as a number of days.
-        """
-        try:
-            years = 0
-            days = int(float(other))
-        except (ValueError, TypeError):
-            if isinstance(other, collections.abc.Iterable):
-                try:
-                    years, days = [int(float(x)) for x in other]
-                except ValueError:
-                    clsname = self.__class__.__name__
-                    raise TypeError(f'other must be one of (int, Iterable[int, int], {clsname}), not {other!r}')
-            else:
-                clsname = self.__class__.__name__
-                raise TypeError(f'other must be one of (int, Iterable[int, int], {clsname}), not {other!r}')
+    def __init__(self, templates: Iterable[str] = ("%x", "%X")):
+        if isinstance(templates, str):
+            raise TypeError(f'templates must be an iterable of strings, not {templates!r}')
 
-        # alias from_absolute_date
-        fabs = self.__class__.from_absolute_date
+        self.formats = [CleressianFormat.compile(template) for template in templates]
+        if not self.formats:
+            raise ValueError('templates must not be empty')
 
-        # naively make the additions
-        x = self.to_absolute_date()
-        x.year += years
-        x.day += days
-
-        # adjust until a valid date
-        while True:
-            offset = -1 if x.day < 1 else 0
-            tmp = fabs(x.year + offset)
-            diy = self.days_in_year(tmp.cycle, tmp.year)
+        self.templates = tuple(fmt.template for fmt in self.formats)
+        self._regex = re.compile('|'.join(f'(?P<_{i}>{fmt._pattern(f"_{i}_")})' for i, fmt in enumerate(self.formats)))
 
-            if 1 <= x.day <= diy:
-                break
+        # the (group name, field key) of each field of each template
+        self._groups = [
+            [(name, name[len(f'_{i}_'):]) for name in self._regex.groupindex if name.startswith(f'_{i}_')]
+            for i in range(len(self.formats))
+        ]
 
-            adj = 2 * offset + 1
-            x.year += adj
-            x.day -= adj * diy
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def compile(cls, templates: Tuple[str, ...] = ("%x", "%X")) -> 'CleressianMultiFormat':
+        """ Return the compiled format for the given templates, reusing a cached one if possible. """
+        return cls(templates)
 
-        return fabs(x.year, x.day)
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.templates!r})'
 
-    def __sub__(self, other: Union[int, Iterable[int], 'CleressianDate']) -> Union[DateDelta, 'CleressianDate']:
-        """ Find the (1) number of years/days between two dates (2) date a given number of years/days in the past
+    def match(self, date_str: str, prefer: Optional[int] = None) -> Tuple[int, Dict[str, str]]:
+        """ Return the index of the (first) template which the string follows, and its fields.
 
-        If `other` is another CleressianDate, do option (1).
-        Otherwise, `other` should be an integer or a 2-iterable of ints. A bare int is interpreted as # of days.
+        If `prefer` is given, the template at that index is tried on its own first.
         """
-        if isinstance(other, CleressianDate):
-            # find the number of years and days between the two dates
-            cls = self.__class__
-            distance = cls.distance(self, other)
-            return distance if self > other else distance * -1
+        if not isinstance(date_str, str):
+            raise TypeError(f'date_str must be a string, not {date_str!r}')
 
-        # otherwise, calculate a date some number of years and days in the past
-        try:
-            years = 0
-            days = int(float(other))
-        except ValueError:
-            if isinstance(other, collections.abc.Iterable):
-                try:
-                    years, days = [int(float(x)) for x in other]
-                except ValueError:
-                    clsname = self.__class__.__name__
-                    raise TypeError(f'other must be one of (int, Iterable[int, int], {clsname}), not {other!r}')
-            else:
-                clsname = self.__class__.__name__
-                raise TypeError(f'other must be one of (int, Iterable[int, int], {clsname}), not {other!r}')
+        if prefer is not None:
+            match = self.formats[prefer]._regex.fullmatch(date_str)
+            if match is not None:
+                return prefer, match.groupdict()
 
-        return self + (-years, -days)
+        match = self._regex.fullmatch(date_str)
+        if match is None:
+            raise ValueError(f'Date data {date_str!r} does not match any of the formats {self.templates!r}')
 
-    @staticmethod
-    def distance(x: 'CleressianDate', y: 'CleressianDate') -> DateDelta:
-        """ Return the number of years and days between two dates, regardless of order. """
-        if not isinstance(x, CleressianDate) or not isinstance(y, CleressianDate):
-            raise TypeError('arguments must be CleressianDate onjects')
+        i = int(match.lastgroup[1:])
+        return i, {key: match.group(name) for name, key in self._groups[i]}
 
-        if x == y:
-            return DateDelta(0, 0)
+    def parse(self, date_str: str, cls: type = None, conflicts: collections.Counter = None) -> 'CleressianDate':
+        """ Parse the string into a date following whichever template it matches first, as in CleressianFormat.parse. """
+        _, fields = self.match(date_str)
+        return CleressianFormat._build(cls or CleressianDate, fields, conflicts)
 
-        # otherwise, swap as necessary to make x < y
-        if x > y:
-            x, y = y, x
+    def inferring_parser(self, sample: int = 100) -> Callable[..., 'CleressianDate']:
+        """ Return a parse function (with the same arguments as parse) for a stream of strings, most of
+        which are expected to follow the same template.
 
-        ax, ay = x.to_absolute_date(), y.to_absolute_date()
-        result = DateDelta()
+        Once `sample` strings have been parsed, the template which the most of them followed is tried
+        on its own first, falling back to the combined regex only for strings which don't follow it.
+        """
+        counts = collections.Counter()
+        preferred = None
 
-        # get the day to line up
-        if ax.day < ay.day:
-            result.days = ay.day - ax.day
-            ax.day = ay.day
-        else:
-            tmp = CleressianDate.from_absolute_date(ax.year)
-            diy = CleressianDate.days_in_year(tmp.cycle, tmp.year)
+        def _parse(date_str: str, cls: type = None, conflicts: collections.Counter = None) -> 'CleressianDate':
+            nonlocal preferred
+            i, fields = self.match(date_str, preferred)
+
+            if preferred is None:
+                counts[i] += 1
+                if sum(counts.values()) >= sample:
+                    preferred = counts.most_common(1)[0][0]
+
+            return CleressianFormat._build(cls or CleressianDate, fields, conflicts)
+
+        return _parse
+
+
+# the number of years in each calendar unit which date_range can step by
+_UNIT_YEARS = {'year': 1, 'cycle': 13, 'grand_cycle': 23 * 13}
+
+
+def _parse_step(step: Union[int, Iterable[int]], unit: str) -> Tuple[int, int, int]:
+    """ Parse the step of a date range into a number of (months, years, days). """
+    if unit == 'day':
+        years, days = CleressianDate._parse_offset(step)
+        months = 0
+    elif unit == 'month':
+        months, years, days = CleressianDate._parse_int('step', step), 0, 0
+    elif unit in _UNIT_YEARS:
+        months, years, days = 0, _UNIT_YEARS[unit] * CleressianDate._parse_int('step', step), 0
+    else:
+        raise ValueError(f"unit must be one of ('day', 'month', 'year', 'cycle', 'grand_cycle'), not {unit!r}")
+
+    if months == years == days == 0:
+        raise ValueError('step must not be zero')
+    if min(months, years, days) < 0 < max(months, years, days):
+        raise ValueError(f'step must not mix positive and negative parts, not {step!r}')
+
+    return months, years, days
+
+
+def _add_months(date: CleressianDate, months: int) -> CleressianDate:
+    """ Return the date the given number of months later, moving the day back to the end of the month if needed. """
+    year, month = divmod(10 * (date.to_absolute_date().year - 1) + date.month - 1 + months, 10)
+    year, month = year + 1, month + 1
+
+    daycap = 34 if month < 10 else _days_before_year(year + 1) - _days_before_year(year) - 9 * 34
+    return CleressianDate.from_absolute_date(year, 34 * (month - 1) + min(date.day, daycap))
+
+
+def _add_years(date: CleressianDate, years: int) -> CleressianDate:
+    """ Return the date the given number of years later, moving a leap day back to the end of a common year. """
+    year, day = date.to_absolute_date()
+    year += years
+    return CleressianDate.fromordinal(_days_before_year(year) + min(day, _days_before_year(year + 1) - _days_before_year(year)) - 1)
+
+
+def date_range(
+    start: CleressianDate,
+    stop: CleressianDate,
+    step: Union[int, Iterable[int]] = 1,
+    unit: str = 'day'
+) -> Iterator[CleressianDate]:
+    """ Lazily generate the dates from start (inclusive) up to stop (exclusive), like range().
+
+    The step counts the given unit, which is one of day, month, year, cycle, or grand_cycle. When
+    stepping by days, the step may also be a DateDelta (or (years, days) pair), added as in __add__.
+    Negative steps count backwards from start, down to stop (exclusive).
+
+    The k-th date is always found from start (rather than from the previous date), so stepping by
+    months from Brilia 30 gives Neyu 6 or 7 (the end of the month), but then Sirelle 30. Likewise,
+    stepping by years (or cycles, or grand cycles) from Neyu 7 gives Neyu 6 in common years.
+    """
+    if not isinstance(start, CleressianDate) or not isinstance(stop, CleressianDate):
+        raise TypeError('start and stop must be CleressianDate objects')
+
+    months, years, days = _parse_step(step, unit)
+    forward = max(months, years, days) > 0
+
+    if months:
+        def _nth(k: int) -> CleressianDate:
+            return _add_months(start, k * months)
+    elif unit in _UNIT_YEARS:
+        def _nth(k: int) -> CleressianDate:
+            return _add_years(start, k * years)
+    elif years:
+        def _nth(k: int) -> CleressianDate:
+            return start + (k * years, k * days)
+    else:
+        def _nth(k: int) -> CleressianDate:
+            return CleressianDate.fromordinal(start.toordinal() + k * days)
+
+    k = 0
+    while True:
+        date = _nth(k)
+        if (date >= stop) if forward else (date <= stop):
+            return
+
+        yield date
+        k += 1
+
+
+def _convert_chunk(args: Tuple[List[str], str, str]) -> Tuple[List[str], int, List[ParseFailure]]:
+    """ Convert a chunk of lines from one template to another, for `convert`. """
+    lines, source, target = args
+    parse = CleressianFormat.compile(source).parse
+    fmt = CleressianFormat.compile(target)
+
+    # as in parse_many, but only counting the conflicts, which main reports once for the whole file
+    conflicts = collections.Counter()
+    converted, failures = [], []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
 
-            result.days = ay.day + (diy - ax.day)
-            ax.day = ay.day
-            ax.year += 1
+        try:
+            converted.append(fmt.format(parse(line, CleressianDate, conflicts)) + '\n')
+        except (ValueError, TypeError) as e:
+            failures.append(ParseFailure(line_number, line, str(e)))
+
+    return converted, sum(conflicts.values()), failures
+
+
+def main(argv: List[str] = None) -> int:
+    """ Command-line interface: python -m cleressian_date convert [-h] ... """
+    import argparse
+    import concurrent.futures
+    import itertools
+    import os
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(prog='python -m cleressian_date')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help='reformat a file of dates, one per line')
+    convert.add_argument('input', help="the file to read ('-' for stdin)")
+    convert.add_argument('-o', '--output', default='-', help="the file to write (default: '-' for stdout)")
+    convert.add_argument('-f', '--from', dest='source', default='%x', help='the template to parse with (default: %%x)')
+    convert.add_argument('-t', '--to', dest='target', default='%X', help='the template to format with (default: %%X)')
+    convert.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                         help='the number of worker processes (default: one per CPU)')
+    convert.add_argument('-n', '--chunk-size', type=int, default=10000, help='the number of lines per chunk (default: 10000)')
+    convert.add_argument('--errors', choices=('raise', 'skip'), default='raise',
+                         help='whether to stop at, or to drop, lines which cannot be parsed (default: raise)')
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error(f'--workers must be at least 1, not {args.workers}')
+    if args.chunk_size < 1:
+        parser.error(f'--chunk-size must be at least 1, not {args.chunk_size}')
+
+    # fail fast on bad templates, rather than in every worker
+    CleressianFormat.compile(args.source)
+    CleressianFormat.compile(args.target)
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    def _chunks():
+        while True:
+            lines = list(itertools.islice(src, args.chunk_size))
+            if not lines:
+                return
+            yield lines, args.source, args.target
 
-        # now, just subtract the years
-        result.years = ay.year - ax.year
+    executor = concurrent.futures.ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    start = time.perf_counter()
+    converted = conflicts = errors = 0
 
-        return result
+    try:
+        if executor is None:
+            results = map(_convert_chunk, _chunks())
+        else:
+            # keep a bounded number of chunks in flight, and collect them in order
+            def _results():
+                pending = []
+                for chunk in _chunks():
+                    pending.append(executor.submit(_convert_chunk, chunk))
+                    if len(pending) >= 2 * args.workers:
+                        yield pending.pop(0).result()
+                for future in pending:
+                    yield future.result()
+
+            results = _results()
+
+        for offset, (lines, chunk_conflicts, failures) in zip(itertools.count(0, args.chunk_size), results):
+            if failures and args.errors == 'raise':
+                failure = failures[0]
+                print(f'line {offset + failure.line_number}: {failure.error}', file=sys.stderr)
+                return 1
+
+            dst.writelines(lines)
+            converted += len(lines)
+            conflicts += chunk_conflicts
+            errors += len(failures)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f'converted {converted} dates in {elapsed:.2f} s ({converted / max(elapsed, 1e-9):.0f} dates/s), '
+        f'{errors} errors, {conflicts} field conflicts',
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -0,0 +1,216 @@
+""" An index of dated (and date-ranged) events, for fast timeline queries. """
+import bisect
+import dataclasses
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cleressian_date import CleressianDate
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    id: int
+    start: CleressianDate
+    end: CleressianDate
+    value: Any = None
+
+
+# ordinals are shifted by this much (to be non-negative) before placing events in the interval tree
+_ORIGIN = -(1 << 62)
+
+
+def _node(s: int, e: int) -> Tuple[int, int]:
+    """ Return the (level, index) of the interval tree node holding the event from s to e (shifted ordinals). """
+    level = (s ^ e).bit_length()
+    return level, s >> level
+
+
+class EventIndex:
+    """ A collection of events, each spanning the dates from its start to its end (inclusive).
+
+    Events are kept in sorted lists of ordinals (see CleressianDate.toordinal), so that queries
+    are binary searches rather than scans:
+
+    - every event by start, to find those starting in a window or soonest after a date
+    - every event by end, to find those ending latest before a date
+    - every event again, in an interval tree over the bits of the ordinals, to find those
+      overlapping a window
+
+    In the interval tree, the node at level L and index i covers the ordinals from i * 2^L to
+    (i + 1) * 2^L - 1, and holds the events which fit in it but not in either half: so every one of
+    them contains the middle of the node. Within a node, the events are sorted by start and by end,
+    so the ones overlapping a window to the left (right) of the middle are a prefix of the former
+    (a suffix of the latter), and a window containing the middle overlaps all of them. Overlap
+    queries therefore take O(log n) per level, plus the number of events found, rather than a scan.
+
+    Query windows are half-open, [start, stop), as in date_range.
+    """
+
+    def __init__(self, events: Iterable[Tuple[CleressianDate, Optional[CleressianDate], Any]] = ()):
+        self._events: Dict[int, Event] = {}
+        self._starts: List[Tuple[int, int]] = []
+        self._ends: List[Tuple[int, int]] = []
+        self._nodes: Dict[Tuple[int, int], Tuple[List[Tuple[int, int]], List[Tuple[int, int, int]]]] = {}
+        self._levels: Dict[int, List[int]] = {}
+        self._ids = itertools.count()
+
+        # build the index in bulk, sorting once at the end
+        for start, end, value in events:
+            event = self._new_event(start, end, value)
+            s, e = event.start.toordinal(), event.end.toordinal()
+            self._starts.append((s, event.id))
+            self._ends.append((e, event.id))
+
+            s, e = s - _ORIGIN, e - _ORIGIN
+            level, i = _node(s, e)
+            if (level, i) not in self._nodes:
+                self._nodes[level, i] = ([], [])
+                self._levels.setdefault(level, []).append(i)
+            by_start, by_end = self._nodes[level, i]
+            by_start.append((s, event.id))
+            by_end.append((e, s, event.id))
+
+        self._starts.sort()
+        self._ends.sort()
+        for by_start, by_end in self._nodes.values():
+            by_start.sort()
+            by_end.sort()
+        for indices in self._levels.values():
+            indices.sort()
+
+    def _new_event(self, start: CleressianDate, end: Optional[CleressianDate], value: Any) -> Event:
+        if end is None:
+            end = start
+
+        if not isinstance(start, CleressianDate) or not isinstance(end, CleressianDate):
+            raise TypeError('start and end must be CleressianDate objects')
+        if end < start:
+            raise ValueError(f'end must not be before start, not {end} < {start}')
+
+        event = Event(next(self._ids), start, end, value)
+        self._events[event.id] = event
+        return event
+
+    #############################################################################################
+    # MODIFICATION METHODS ######################################################################
+    #############################################################################################
+
+    def insert(self, start: CleressianDate, end: Optional[CleressianDate] = None, value: Any = None) -> Event:
+        """ Add an event spanning start to end (inclusive), or just the start date if end is None. """
+        event = self._new_event(start, end, value)
+        s, e = event.start.toordinal(), event.end.toordinal()
+
+        bisect.insort(self._starts, (s, event.id))
+        bisect.insort(self._ends, (e, event.id))
+
+        s, e = s - _ORIGIN, e - _ORIGIN
+        level, i = _node(s, e)
+        if (level, i) not in self._nodes:
+            self._nodes[level, i] = ([], [])
+            bisect.insort(self._levels.setdefault(level, []), i)
+        by_start, by_end = self._nodes[level, i]
+        bisect.insort(by_start, (s, event.id))
+        bisect.insort(by_end, (e, s, event.id))
+
+        return event
+
+    def delete(self, event_id: int) -> Event:
+        """ Remove the event with the given id from the index, and return it. """
+        try:
+            event = self._events.pop(event_id)
+        except KeyError:
+            raise KeyError(f'no event with id {event_id!r}') from None
+
+        s, e = event.start.toordinal(), event.end.toordinal()
+        level, i = _node(s - _ORIGIN, e - _ORIGIN)
+        by_start, by_end = self._nodes[level, i]
+
+        for entries, key in ((self._starts, (s, event_id)), (self._ends, (e, event_id)),
+                             (by_start, (s - _ORIGIN, event_id)), (by_end, (e - _ORIGIN, s - _ORIGIN, event_id))):
+            del entries[bisect.bisect_left(entries, key)]
+
+        if not by_start:
+            del self._nodes[level, i]
+            indices = self._levels[level]
+            del indices[bisect.bisect_left(indices, i)]
+            if not indices:
+                del self._levels[level]
+
+        return event
+
+    #############################################################################################
+    # QUERY METHODS #############################################################################
+    #############################################################################################
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        """ Iterate over the events in order of start date. """
+        return (self._events[i] for _, i in self._starts)
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self._events
+
+    def __getitem__(self, event_id: int) -> Event:
+        return self._events[event_id]
+
+    def starting(self, start: CleressianDate, stop: CleressianDate) -> List[Event]:
+        """ Return the events which start in [start, stop), in order of start date. """
+        lo = bisect.bisect_left(self._starts, (start.toordinal(),))
+        hi = bisect.bisect_left(self._starts, (stop.toordinal(),))
+        return [self._events[i] for _, i in self._starts[lo:hi]]
+
+    def overlapping(self, start: CleressianDate, stop: CleressianDate) -> List[Event]:
+        """ Return the events which take place on any date in [start, stop), in order of start date. """
+        # the window, as inclusive (shifted) ordinals
+        a, c = start.toordinal() - _ORIGIN, stop.toordinal() - 1 - _ORIGIN
+        if c < a:
+            return []
+
+        found = []
+        for level, indices in self._levels.items():
+            # only the nodes at this level covering some of the window can hold overlapping events
+            lo = bisect.bisect_left(indices, a >> level)
+            hi = bisect.bisect_right(indices, c >> level)
+            for i in indices[lo:hi]:
+                by_start, by_end = self._nodes[level, i]
+                middle = (i << level) + (1 << level >> 1)
+
+                if c < middle:
+                    # every event reaches the middle, so those starting in time overlap
+                    found.extend(by_start[:bisect.bisect_left(by_start, (c + 1,))])
+                elif a > middle:
+                    # every event starts by the middle, so those ending in time overlap
+                    found.extend((s, j) for _, s, j in by_end[bisect.bisect_left(by_end, (a,)):])
+                else:
+                    found.extend(by_start)
+
+        found.sort()
+        return [self._events[i] for _, i in found]
+
+    def at(self, date: CleressianDate) -> List[Event]:
+        """ Return the events which take place on the given date, in order of start date. """
+        return self.overlapping(date, date + 1)
+
+    def nearest(self, date: CleressianDate) -> Optional[Event]:
+        """ Return an event closest to the given date: one taking place on it if possible, or else
+        the one ending most recently before it or starting soonest after it, whichever is nearer.
+        Ties go to the earlier event. Returns None if the index is empty.
+        """
+        covering = self.at(date)
+        if covering:
+            return covering[0]
+
+        d = date.toordinal()
+        i = bisect.bisect_left(self._ends, (d,))
+        j = bisect.bisect_left(self._starts, (d,))
+
+        before = self._events[self._ends[i - 1][1]] if i > 0 else None
+        after = self._events[self._starts[j][1]] if j < len(self._starts) else None
+
+        if before is None or after is None:
+            return before or after
+        if d - before.end.toordinal() <= after.start.toordinal() - d:
+            return before
+        return after
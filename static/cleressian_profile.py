@@ -0,0 +1,159 @@
+""" Opt-in instrumentation of cleressian_date, to see where time goes in the calendar code.
+
+    >>> with cleressian_profile.profile() as stats:
+    ...     run_job()
+    >>> print(stats.to_json())
+
+While disabled (the default), nothing is instrumented, so there is no cost at all: enabling
+replaces the instrumented methods of CleressianDate with counting and timing wrappers, and
+disabling puts the originals back. Times are inclusive, so (e.g.) the time spent constructing
+the result of strptime is counted under both strptime and construct.
+"""
+import collections
+import contextlib
+import dataclasses
+import functools
+import json
+import time
+from typing import Dict, Iterator
+
+import cleressian_date
+from cleressian_date import CleressianDate
+
+# the instrumented methods of CleressianDate, and the names under which they are reported
+TARGETS = {
+    '__init__': 'construct',
+    '_trusted': 'construct.trusted',
+    '_parse_month': '_parse_month',
+    'from_absolute_date': 'from_absolute_date',
+    'fromordinal': 'fromordinal',
+    'to_absolute_date': 'to_absolute_date',
+    '__add__': '__add__',
+    '__sub__': '__sub__',
+    'distance': 'distance',
+    'strftime': 'strftime',
+    'strptime': 'strptime',
+}
+
+
+@dataclasses.dataclass
+class Timing:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclasses.dataclass
+class Stats:
+    """ A snapshot of the counts and (inclusive) times of the instrumented calls, and of the fields
+    overwritten by strptime (see CleressianDate.strptime).
+    """
+    timings: Dict[str, Timing] = dataclasses.field(default_factory=dict)
+    overwrites: Dict[str, int] = dataclasses.field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def dump(self, path: str):
+        """ Write the stats as JSON to the given file. """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+
+_timings: Dict[str, Timing] = collections.defaultdict(Timing)
+_overwrites: Dict[str, int] = collections.Counter()
+_originals = {}
+
+
+def _count_overwrite(name: str):
+    _overwrites[name] += 1
+
+
+def _instrument(func, name: str):
+    timing = _timings[name]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing.calls += 1
+            timing.seconds += time.perf_counter() - start
+
+    return wrapper
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable():
+    """ Start counting and timing calls. This does nothing if already enabled. """
+    if is_enabled():
+        return
+
+    for attr, name in TARGETS.items():
+        original = CleressianDate.__dict__[attr]
+        if isinstance(original, (staticmethod, classmethod)):
+            wrapped = type(original)(_instrument(original.__func__, name))
+        else:
+            wrapped = _instrument(original, name)
+
+        _originals[attr] = original
+        setattr(CleressianDate, attr, wrapped)
+
+    cleressian_date._overwrite_hook = _count_overwrite
+
+
+def disable():
+    """ Stop counting and timing calls, restoring the original methods. The stats are kept. """
+    for attr, original in _originals.items():
+        setattr(CleressianDate, attr, original)
+
+    _originals.clear()
+    cleressian_date._overwrite_hook = None
+
+
+def reset():
+    """ Clear the stats collected so far. """
+    for timing in _timings.values():
+        timing.calls, timing.seconds = 0, 0.0
+    _overwrites.clear()
+
+
+def snapshot() -> Stats:
+    """ Return a copy of the stats collected so far. """
+    return Stats(
+        timings={name: Timing(t.calls, t.seconds) for name, t in _timings.items() if t.calls},
+        overwrites=dict(_overwrites)
+    )
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Stats]:
+    """ Collect stats for the duration of the block, into the yielded Stats (which is filled in at exit).
+
+    Blocks may be nested; each one reports only the calls made within it.
+    """
+    before = snapshot()
+    was_enabled = is_enabled()
+    enable()
+
+    stats = Stats()
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+
+        after = snapshot()
+        for name, t in after.timings.items():
+            prev = before.timings.get(name, Timing())
+            if t.calls > prev.calls:
+                stats.timings[name] = Timing(t.calls - prev.calls, t.seconds - prev.seconds)
+        for name, count in after.overwrites.items():
+            if count > before.overwrites.get(name, 0):
+                stats.overwrites[name] = count - before.overwrites.get(name, 0)
@@ -0,0 +1,260 @@
+""" Recurrence rules (in the style of RFC 5545's RRULE) over CleressianDates.
+
+    >>> # every Neyu 1
+    >>> RecurrenceRule('year', start, by_month=[10], by_month_day=[1])
+    >>> # the last day of each year (Neyu 6 or 7)
+    >>> RecurrenceRule('year', start, by_year_day=[-1])
+    >>> # every day of the 3rd year of each cycle
+    >>> RecurrenceRule('day', start, by_year_of_cycle=[3])
+    >>> # the start of each grand cycle
+    >>> RecurrenceRule('grand_cycle', CleressianDate(1, 1, 1, 1, 1))
+"""
+import itertools
+from typing import Iterable, Iterator, List, Optional
+
+from cleressian_date import CALENDAR, CleressianDate, _days_before_year
+
+# the number of years in each period of each frequency
+_PERIOD_YEARS = {'day': 1, 'month': 1, 'year': 1, 'cycle': 13, 'grand_cycle': 23 * 13}
+
+
+def _parse_filter(name: str, values: Optional[Iterable[int]], lo: int, hi: int, negative: bool = False) -> Optional[List[int]]:
+    """ Check that every value of a by_* filter lies in [lo, hi] (or in [-hi, -lo], if negative is allowed). """
+    if values is None:
+        return None
+
+    values = sorted(set(CleressianDate._parse_int(name, v) for v in values))
+    for v in values:
+        if not (lo <= v <= hi or (negative and -hi <= v <= -lo)):
+            raise ValueError(f'{name} values must be between {lo} and {hi}' + (' (or negated)' if negative else '') + f', not {v!r}')
+
+    if not values:
+        raise ValueError(f'{name} must not be empty')
+    return values
+
+
+def _resolve(values: List[int], length: int) -> List[int]:
+    """ Resolve 1-indexed values, where negative values count back from the end, against the given length. """
+    return sorted(set(v if v > 0 else length + 1 + v for v in values if -length <= v <= length))
+
+
+class RecurrenceRule:
+    """ A recurring set of dates, starting from dtstart.
+
+    The frequency (day, month, year, cycle, or grand_cycle) and interval give the periods in which
+    dates may recur: every interval-th period, counting from the one containing dtstart. Within these
+    periods, the dates are those which match every by_* filter given:
+
+    by_month            month numbers (1-10)
+    by_month_day        days of the month (1-34), or negative to count back from the end (-1 is the last)
+    by_year_day         days of the year (1-313), or negative to count back from the end
+    by_year_of_cycle    years of the cycle (1-13)
+    by_cycle            cycles of the grand cycle (1-23)
+
+    As in RRULE, filters which are not given are filled in from dtstart so that the rule recurs once
+    per period: a yearly rule recurs on dtstart's month and day, a monthly rule on dtstart's day, and
+    so on. Months which are too short for a day of the month (e.g., Neyu 30) are skipped.
+
+    The dates are generated lazily and in order, from dtstart (inclusive), stopping after `count`
+    dates or after `until` (inclusive), if given. Periods and years which cannot match are skipped
+    arithmetically, rather than by checking each day.
+    """
+
+    def __init__(
+        self,
+        freq: str,
+        dtstart: CleressianDate,
+        interval: int = 1,
+        by_month: Optional[Iterable[int]] = None,
+        by_month_day: Optional[Iterable[int]] = None,
+        by_year_day: Optional[Iterable[int]] = None,
+        by_year_of_cycle: Optional[Iterable[int]] = None,
+        by_cycle: Optional[Iterable[int]] = None,
+        count: Optional[int] = None,
+        until: Optional[CleressianDate] = None
+    ):
+        if freq not in _PERIOD_YEARS:
+            raise ValueError(f"freq must be one of ('day', 'month', 'year', 'cycle', 'grand_cycle'), not {freq!r}")
+        if not isinstance(dtstart, CleressianDate):
+            raise TypeError(f'dtstart must be a CleressianDate, not {dtstart!r}')
+        if until is not None and not isinstance(until, CleressianDate):
+            raise TypeError(f'until must be a CleressianDate, not {until!r}')
+
+        self.freq = freq
+        self.dtstart = dtstart
+        self.interval = CleressianDate._parse_int('interval', interval)
+        if self.interval < 1:
+            raise ValueError(f'interval must be positive, not {interval!r}')
+
+        self.count = None if count is None else CleressianDate._parse_int('count', count)
+        self.until = until
+
+        self.by_month = _parse_filter('by_month', by_month, 1, 10)
+        self.by_month_day = _parse_filter('by_month_day', by_month_day, 1, 34, negative=True)
+        self.by_year_day = _parse_filter('by_year_day', by_year_day, 1, 313, negative=True)
+        self.by_year_of_cycle = _parse_filter('by_year_of_cycle', by_year_of_cycle, 1, 13)
+        self.by_cycle = _parse_filter('by_cycle', by_cycle, 1, 23)
+
+        # fill in the filters which the frequency needs to recur once per period
+        if freq in ('month', 'year', 'cycle', 'grand_cycle') and self.by_month_day is None and self.by_year_day is None:
+            self.by_month_day = [dtstart.day]
+            if freq != 'month' and self.by_month is None:
+                self.by_month = [dtstart.month]
+        if freq in ('cycle', 'grand_cycle') and self.by_year_of_cycle is None:
+            self.by_year_of_cycle = [dtstart.year]
+        if freq == 'grand_cycle' and self.by_cycle is None:
+            self.by_cycle = [dtstart.cycle]
+
+    def __repr__(self) -> str:
+        params = ['freq', 'dtstart', 'interval', 'by_month', 'by_month_day', 'by_year_day', 'by_year_of_cycle',
+                  'by_cycle', 'count', 'until']
+        return f'{self.__class__.__name__}(' + ', '.join(f'{k}={getattr(self, k)!r}' for k in params) + ')'
+
+    #############################################################################################
+    # GENERATION ################################################################################
+    #############################################################################################
+
+    def _years(self, from_year: int) -> Iterator[int]:
+        """ Generate the absolute years, from the given one, which fall in a period of the rule
+        and match the year filters, stopping if no more can.
+        """
+        length = _PERIOD_YEARS[self.freq]
+        step = self.interval if self.freq in ('year', 'cycle', 'grand_cycle') else 1
+
+        # skip straight to the first period of the rule containing (or after) from_year
+        first = (self.dtstart.to_absolute_date().year - 1) // length
+        period = max((from_year - 1) // length, first)
+        period += -(period - first) % step
+
+        # the years of the rule repeat (at the latest) after this many years, so if none match in that
+        # long, none ever will
+        give_up = 299 * self.interval * length
+        last_found = from_year
+
+        while period * length + 1 - last_found <= give_up:
+            for year in range(max(period * length + 1, from_year), (period + 1) * length + 1):
+                r = (year - 1) % 299
+                if self.by_cycle is not None and r // 13 + 1 not in self.by_cycle:
+                    continue
+                if self.by_year_of_cycle is not None and r % 13 + 1 not in self.by_year_of_cycle:
+                    continue
+
+                last_found = year
+                yield year
+
+            period += step
+
+    def _days_of_year(self, year: int, months: Iterable[int] = range(1, 11)) -> Iterator[int]:
+        """ Generate the days of the given absolute year, in the given months, which match the month and
+        day filters, in order.
+        """
+        leap = CALENDAR.leap[(year - 1) % 299]
+        if self.by_month is not None:
+            months = [month for month in months if month in self.by_month]
+
+        if self.by_year_day is not None:
+            for day in _resolve(self.by_year_day, 312 + leap):
+                month, d = CALENDAR.month_day[day]
+                if month not in months:
+                    continue
+                if self.by_month_day is not None and d not in _resolve(self.by_month_day, CALENDAR.month_length[leap][month]):
+                    continue
+                yield day
+            return
+
+        for month in months:
+            length = CALENDAR.month_length[leap][month]
+            days = range(1, length + 1) if self.by_month_day is None else _resolve(self.by_month_day, length)
+            for d in days:
+                yield CALENDAR.month_start[month] + d
+
+    def _occurrences(self, from_year: int) -> Iterator[CleressianDate]:
+        """ Generate the dates of the rule, ignoring count and until, from the given absolute year. """
+        start = self.dtstart.toordinal()
+        start_month = 10 * (self.dtstart.to_absolute_date().year - 1) + self.dtstart.month - 1
+
+        # the pattern of dates repeats (at the latest) after this many years, so if there are no dates
+        # in that long, there never will be
+        give_up = 299 * self.interval * _PERIOD_YEARS[self.freq]
+        last_found = from_year
+
+        # the matching days of a year depend only on whether it is a leap year (and, for a monthly
+        # rule, on which of its months are in a period of the rule)
+        days_of_year = {}
+
+        for year in self._years(from_year):
+            if year - last_found > give_up:
+                return
+
+            leap = CALENDAR.leap[(year - 1) % 299]
+            months = range(1, 11)
+            if self.freq == 'month':
+                # only every interval-th month, counting from dtstart's, is in a period of the rule
+                months = range((start_month - 10 * (year - 1)) % self.interval + 1, 11, self.interval)
+                if not months:
+                    continue
+
+            key = (leap, months)
+            if key not in days_of_year:
+                days = list(self._days_of_year(year, months))
+                days_of_year[key] = days, set(days)
+            days, matching = days_of_year[key]
+
+            before = _days_before_year(year)
+            if self.freq == 'day' and self.interval > 1:
+                # only every interval-th day, counting from dtstart, is in a period of the rule: step
+                # through those days or through the matching ones, whichever are fewer
+                lo = max(before, start)
+                stepped = range(lo + (start - lo) % self.interval - before + 1, 312 + leap + 1, self.interval)
+                if len(stepped) < len(days):
+                    days = [day for day in stepped if day in matching]
+                else:
+                    days = [day for day in days if (before + day - 1 - start) % self.interval == 0]
+
+            for day in days:
+                ordinal = before + day - 1
+                if ordinal < start:
+                    continue
+
+                last_found = year
+                yield CleressianDate.fromordinal(ordinal)
+
+    def __iter__(self) -> Iterator[CleressianDate]:
+        dates = self._occurrences(self.dtstart.to_absolute_date().year)
+        if self.until is not None:
+            dates = itertools.takewhile(lambda date: date <= self.until, dates)
+        if self.count is not None:
+            dates = itertools.islice(dates, self.count)
+        return dates
+
+    def after(self, date: CleressianDate, inclusive: bool = False) -> Optional[CleressianDate]:
+        """ Return the first date of the rule after (or on, if inclusive) the given date, or None. """
+        if self.count is None:
+            # without a count, there's no need to generate any of the earlier dates
+            dates = self._occurrences(max(date.to_absolute_date().year, self.dtstart.to_absolute_date().year))
+            if self.until is not None:
+                dates = itertools.takewhile(lambda d: d <= self.until, dates)
+        else:
+            dates = iter(self)
+
+        for d in dates:
+            if d > date or (inclusive and d == date):
+                return d
+        return None
+
+    def between(self, start: CleressianDate, stop: CleressianDate) -> Iterator[CleressianDate]:
+        """ Generate the dates of the rule in [start, stop). """
+        first = self.after(start, inclusive=True)
+        if first is None or first >= stop:
+            return
+
+        if self.count is None:
+            dates = self._occurrences(first.to_absolute_date().year)
+        else:
+            dates = iter(self)
+
+        for d in dates:
+            if d >= stop or (self.until is not None and d > self.until):
+                return
+            if d >= first:
+                yield d
@@ -0,0 +1,228 @@
+""" Columns of dates in shared memory, which worker processes can read and write without pickling any dates.
+
+    >>> with SharedDateColumn.from_array(dates) as column:
+    ...     # each worker attaches to the column by name, and writes its chunk of the output in place
+    ...     with column.map(_shift) as shifted:
+    ...         shifted.array.tolist()
+
+A column is a named block of shared memory holding the same 16-byte header as a column file (see
+CleressianDateArray.save), followed by the ordinals, so attaching needs nothing but the name. Passing
+a SharedDateColumn to another process (e.g., as an argument to an executor) passes only its name.
+
+Requires Python 3.8+ (for multiprocessing.shared_memory).
+"""
+import concurrent.futures
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from cleressian_array import _COLUMN_HEADER, _COLUMN_MAGIC, _COLUMN_VERSION, CleressianDateArray
+from cleressian_date import CleressianDate
+
+
+class SharedDateColumn:
+    """ A one-dimensional column of dates, stored as ordinals in a named block of shared memory.
+
+    The process which creates the column owns it: closing the column there (or leaving its `with`
+    block) also frees the memory. Other processes attach to the column by name, and only close it.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        magic, version, width, count = _COLUMN_HEADER.unpack_from(shm.buf)
+        if magic != _COLUMN_MAGIC or width not in (4, 8):
+            raise ValueError(f'not a shared date column: {shm.name!r}')
+        if version != _COLUMN_VERSION:
+            raise ValueError(f'unsupported shared date column version {version!r}: {shm.name!r}')
+
+        self._shm = shm
+        self._owner = owner
+        self._unpickled = False
+        self._ordinals = np.ndarray((count,), dtype=np.dtype(f'i{width}'), buffer=shm.buf, offset=_COLUMN_HEADER.size)
+
+    #############################################################################################
+    # CONSTRUCTORS ##############################################################################
+    #############################################################################################
+
+    @classmethod
+    def create(cls, length: int, dtype: Union[type, np.dtype] = np.int64, name: Optional[str] = None) -> 'SharedDateColumn':
+        """ Create a new column of the given length (filled with 1:1:1 Sirelle 1), owned by this process. """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype(np.int32), np.dtype(np.int64)):
+            raise TypeError(f'dtype must be int32 or int64, not {dtype!r}')
+        length = CleressianDate._parse_int('length', length)
+        if length < 0:
+            raise ValueError(f'length must not be negative, not {length!r}')
+
+        # a block can't be empty, so always leave room for at least one ordinal
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_COLUMN_HEADER.size + max(length, 1) * dtype.itemsize)
+        _COLUMN_HEADER.pack_into(shm.buf, 0, _COLUMN_MAGIC, _COLUMN_VERSION, dtype.itemsize, length)
+
+        column = cls(shm, owner=True)
+        column._ordinals[:] = 0
+        return column
+
+    @classmethod
+    def from_array(
+        cls,
+        dates: Union[CleressianDateArray, Iterable[CleressianDate]],
+        name: Optional[str] = None
+    ) -> 'SharedDateColumn':
+        """ Create a new column holding a copy of the given dates, owned by this process. """
+        if not isinstance(dates, CleressianDateArray):
+            dates = CleressianDateArray.from_dates(dates)
+
+        ordinals = dates.ordinals.ravel()
+        column = cls.create(len(ordinals), dates.dtype, name)
+        column._ordinals[:] = ordinals
+        return column
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedDateColumn':
+        """ Attach to an existing column (e.g., one created by another process) by name. """
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False))
+
+        # before 3.13, attaching registers the block with this process's resource tracker, which would
+        # then free it when this process exits: only the owner should do that
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm)
+
+    @classmethod
+    def _unpickle(cls, name: str) -> 'SharedDateColumn':
+        """ Attach to a column passed from another process (see map). """
+        column = cls.attach(name)
+        column._unpickled = True
+        return column
+
+    def __reduce__(self):
+        return self.__class__._unpickle, (self.name,)
+
+    #############################################################################################
+    # ACCESSORS #################################################################################
+    #############################################################################################
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def array(self) -> CleressianDateArray:
+        """ Return the dates as a CleressianDateArray, without copying: writing to its ordinals writes to the column. """
+        array = CleressianDateArray.__new__(CleressianDateArray)
+        array.ordinals = self._ordinals
+        return array
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(name={self.name!r}, length={len(self)}, dtype={self._ordinals.dtype.name})'
+
+    #############################################################################################
+    # LIFETIME METHODS ##########################################################################
+    #############################################################################################
+
+    def close(self):
+        """ Detach from the column, freeing it if this process owns it.
+
+        Any arrays viewing the column (see `array`) must have been deleted first.
+        """
+        if self._shm is None:
+            return
+
+        self._ordinals = None
+        self._shm.close()
+        if self._owner:
+            if sys.version_info < (3, 13):
+                # a process sharing our resource tracker (e.g., a forked worker) may have unregistered the
+                # block when attaching (see attach), so register it again for unlink to unregister
+                resource_tracker.register(self._shm._name, 'shared_memory')
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'SharedDateColumn':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    #############################################################################################
+    # PARALLEL METHODS ##########################################################################
+    #############################################################################################
+
+    def map(
+        self,
+        func: Callable[[CleressianDateArray], CleressianDateArray],
+        executor: Optional[concurrent.futures.Executor] = None,
+        chunk_size: int = 1_000_000,
+        out: Optional['SharedDateColumn'] = None
+    ) -> 'SharedDateColumn':
+        """ Apply func to the column in chunks, in parallel, writing the results to `out` (by default, a
+        new column of the same length and dtype, owned by this process), and return `out`.
+
+        func must take a CleressianDateArray (a view of one chunk) and return one of the same length,
+        and must be picklable (e.g., a module-level function): it is all that is sent to the workers,
+        along with the names of the columns and the bounds of each chunk. `out` may be the column
+        itself, to update it in place.
+
+        By default, the chunks are processed in a new ProcessPoolExecutor with one worker per CPU.
+        """
+        if chunk_size < 1:
+            raise ValueError(f'chunk_size must be positive, not {chunk_size!r}')
+
+        new_out = out is None
+        if new_out:
+            out = self.create(len(self), self._ordinals.dtype)
+        elif len(out) != len(self):
+            raise ValueError(f'out must have the same length as the column, not {len(out)} != {len(self)}')
+
+        own_executor = executor is None
+        if own_executor:
+            executor = concurrent.futures.ProcessPoolExecutor()
+
+        futures = []
+        try:
+            for start in range(0, len(self), chunk_size):
+                futures.append(executor.submit(_map_chunk, func, self, out, (start, min(start + chunk_size, len(self)))))
+            for future in futures:
+                future.result()
+        except BaseException:
+            # let the other chunks finish with the output before freeing it
+            for future in futures:
+                future.cancel()
+            concurrent.futures.wait(futures)
+            if new_out:
+                out.close()
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        return out
+
+
+def _map_chunk(
+    func: Callable[[CleressianDateArray], CleressianDateArray],
+    column: SharedDateColumn,
+    out: SharedDateColumn,
+    bounds: Tuple[int, int]
+):
+    """ Apply func to column[start:stop], writing the results to out[start:stop], for SharedDateColumn.map. """
+    start, stop = bounds
+    try:
+        result = func(column.array[start:stop])
+        if len(result) != stop - start:
+            raise ValueError(f'func must return as many dates as it is given, not {len(result)} != {stop - start}')
+
+        out._ordinals[start:stop] = result.ordinals
+        del result
+    finally:
+        # only close the columns which were attached just for this chunk (i.e., not the caller's own,
+        # when run in a thread)
+        if column._unpickled and column is not out:
+            column.close()
+        if out._unpickled:
+            out.close()